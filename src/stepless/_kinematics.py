@@ -0,0 +1,54 @@
+"""Jitted kernels for Ball's kinematic evaluation.
+
+For a length-2 vector, NumPy's per-call ufunc dispatch costs far more
+than the multiply-adds themselves, so the polynomial evaluations behind
+`Ball.x_at`/`v_at` (and the collision shift applied to a ball's state)
+run here as compiled scalar arithmetic, allocating just the one result
+array each.
+"""
+import numpy as np
+from numba import njit
+
+@njit(cache=True, fastmath=True)
+def x_at(x, v, a, t: float) -> np.ndarray:
+    r"""$$\vec{x} = \frac{1}{2} \vec{a}_0 t^2 + \vec{v}_0 t + \vec{x}_0$$"""
+    out = np.empty(2)
+    out[0] = (a[0]/2*t + v[0])*t + x[0]
+    out[1] = (a[1]/2*t + v[1])*t + x[1]
+    return out
+
+@njit(cache=True, fastmath=True)
+def v_at(v, a, t: float) -> np.ndarray:
+    r"""$$\vec{v} = \vec{a}_0 t + \vec{v}_0$$"""
+    out = np.empty(2)
+    out[0] = a[0]*t + v[0]
+    out[1] = a[1]*t + v[1]
+    return out
+
+@njit(cache=True, fastmath=True)
+def collision_deltas(x, v, r: float) -> tuple:
+    r"""The contact-displacement and velocity-projection deltas of a
+    collision impulse, from the pair's separation `x`, relative velocity
+    `v`, and contact distance `r` -- all scalar arithmetic."""
+    xx = x[0]*x[0] + x[1]*x[1]
+    scale = 1 - r / np.sqrt(xx)
+    proj = (v[0]*x[0] + v[1]*x[1]) / xx
+    dx = np.empty(2)
+    dv = np.empty(2)
+    dx[0] = x[0] * scale
+    dx[1] = x[1] * scale
+    dv[0] = x[0] * proj
+    dv[1] = x[1] * proj
+    return dx, dv
+
+@njit(cache=True, fastmath=True)
+def collision_shift(x, v, dx, dv, t: float) -> tuple:
+    r"""State update for a collision impulse: the new virtual-t=0
+    position and velocity after applying `dx`/`dv` at time `t`."""
+    new_x = np.empty(2)
+    new_v = np.empty(2)
+    new_v[0] = v[0] + dv[0]
+    new_v[1] = v[1] + dv[1]
+    new_x[0] = x[0] - dv[0]*t + dx[0]
+    new_x[1] = x[1] - dv[1]*t + dx[1]
+    return new_x, new_v
@@ -0,0 +1,266 @@
+r"""Closed-form polynomial root kernels, JIT-compiled with numba.
+
+The collision-time computation in `Ball.compute_collision_times` reduces to
+finding the roots of a fixed degree-4 polynomial.  `np.poly1d(...).roots`
+solves this by building a companion matrix and running a full complex
+eigendecomposition -- enormous overhead for a quartic evaluated once per
+ball pair per step.  The kernels here instead use the classical
+Ferrari/Cardano closed forms on plain float64 scalars, so the whole solve
+compiles down to a handful of arithmetic instructions.
+"""
+import cmath
+import math
+import numpy as np
+from numba import njit, prange
+
+_NAN = complex(np.nan, np.nan)
+
+_REAL_EPS = 100 * np.finfo(np.float64).eps
+"""Imaginary-part tolerance below which a root counts as real,
+matching `np.real_if_close`'s default."""
+
+@njit(cache=True, fastmath=True)
+def _cubic_monic(A: float, B: float, C: float) -> np.ndarray:
+    r"""All three complex roots of the monic cubic $$z^3 + A z^2 + B z + C$$."""
+    out = np.empty(3, dtype=np.complex128)
+    # depress: z = w - A/3
+    p = B - A*A / 3
+    q = 2*A*A*A / 27 - A*B / 3 + C
+    D = cmath.sqrt(q*q / 4 + p*p*p / 27)
+    u3 = -q/2 + D
+    if abs(u3) < abs(-q/2 - D):
+        u3 = -q/2 - D # pick the larger branch for stability
+    if u3 == 0: # p == q == 0: triple root
+        out[0] = out[1] = out[2] = -A/3
+        return out
+    u = u3 ** (1/3)
+    w = complex(-0.5, 0.8660254037844386) # primitive cube root of unity
+    for k in range(3):
+        out[k] = u - p / (3*u) - A/3
+        u = u * w
+    return out
+
+@njit(cache=True, fastmath=True)
+def _quartic_roots(c4: float, c3: float, c2: float, c1: float, c0: float) -> np.ndarray:
+    r"""All roots of $$c_4 t^4 + c_3 t^3 + c_2 t^2 + c_1 t + c_0 = 0$$.
+
+    Always returns a length-4 complex128 array; when the leading
+    coefficients vanish the unused trailing entries are NaN-filled
+    (mirroring `np.poly1d`'s coefficient trimming).
+    """
+    out = np.full(4, _NAN, dtype=np.complex128)
+    if c4 == 0:
+        if c3 == 0:
+            if c2 == 0:
+                if c1 == 0:
+                    return out # constant: no roots
+                out[0] = -c0 / c1
+                return out
+            disc = cmath.sqrt(complex(c1*c1 - 4*c2*c0, 0))
+            out[0] = (-c1 + disc) / (2*c2)
+            out[1] = (-c1 - disc) / (2*c2)
+            return out
+        out[:3] = _cubic_monic(c2/c3, c1/c3, c0/c3)
+        return out
+
+    # depress: t = y - c3/(4 c4) gives y^4 + p y^2 + q y + r
+    A = c3/c4
+    B = c2/c4
+    C = c1/c4
+    D = c0/c4
+    p = B - 3*A*A / 8
+    q = C - A*B / 2 + A*A*A / 8
+    r = D - A*C / 4 + A*A*B / 16 - 3*A*A*A*A / 256
+    shift = A / 4
+
+    if q == 0: # biquadratic: y^2 solves z^2 + p z + r
+        disc = cmath.sqrt(complex(p*p - 4*r, 0))
+        z1 = (-p + disc) / 2
+        z2 = (-p - disc) / 2
+        y1 = cmath.sqrt(z1)
+        y2 = cmath.sqrt(z2)
+        out[0] = y1 - shift
+        out[1] = -y1 - shift
+        out[2] = y2 - shift
+        out[3] = -y2 - shift
+        return out
+
+    # Ferrari: pick m solving the resolvent cubic
+    #   8 m^3 + 8 p m^2 + (2 p^2 - 8 r) m - q^2 = 0
+    # so the quartic splits into two quadratics in y.
+    ms = _cubic_monic(p, p*p/4 - r, -q*q/8)
+    m = ms[0]
+    if abs(ms[1]) > abs(m):
+        m = ms[1]
+    if abs(ms[2]) > abs(m):
+        m = ms[2]
+    s = cmath.sqrt(2*m) # nonzero since q != 0
+    t0 = p/2 + m + q / (2*s)
+    t1 = p/2 + m - q / (2*s)
+    d0 = cmath.sqrt(s*s - 4*t0)
+    d1 = cmath.sqrt(s*s - 4*t1)
+    out[0] = ( s + d0) / 2 - shift
+    out[1] = ( s - d0) / 2 - shift
+    out[2] = (-s + d1) / 2 - shift
+    out[3] = (-s - d1) / 2 - shift
+    return out
+
+@njit(cache=True, fastmath=True)
+def _next_collision_time(c4: float, c3: float, c2: float, c1: float, c0: float,
+        t: float, eps: float = _REAL_EPS) -> float:
+    r"""Smallest real root of the collision quartic after `t` at which the
+    pair is *approaching* (squared separation decreasing), or $$+\infty$$
+    when no such root exists.
+
+    Fusing the root filter into the kernel keeps the complex root array
+    (and the per-root `np.real_if_close` calls of `next_time_after`) from
+    ever crossing the Python boundary.  Filtering for approach direction
+    rejects the exit crossings of the separation polynomial -- in
+    particular the just-resolved contact itself, which rounding can
+    otherwise re-detect a few ulps after `t` and bounce a second time.
+    """
+    if c4 == 0 and c3 == 0:
+        # Ballistic case (equal accelerations), by far the most common:
+        # a plain real quadratic, no root array or complex math needed.
+        # The degree tests are exact rather than tolerance-based on
+        # purpose -- a tiny but nonzero |da|^2/4 still encodes a real
+        # long-horizon collision that trimming would discard.
+        if c2 == 0:
+            if c1 >= 0: # constant or growing separation never impacts
+                return np.inf
+            root = -c0 / c1
+            return root if root > t else np.inf
+        # Separating early-out: when the parabola is convex (true for
+        # collision input, where c2 = |dv|^2), a pair that is apart and
+        # moving apart at time t stays apart forever -- skip the
+        # discriminant and sqrt.
+        if c2 > 0 and (c2*t + c1)*t + c0 > 0 and 2*c2*t + c1 >= 0:
+            return np.inf
+        disc = c1*c1 - 4*c2*c0
+        if disc <= 0: # no crossing (a tangent graze carries no impulse)
+            return np.inf
+        # The onset crossing is always (-c1 - sqrt(disc))/(2 c2): its
+        # slope evaluates to exactly -sqrt(disc), negative for either
+        # parabola orientation, so no root ordering or slope test is
+        # needed -- one compare decides.
+        onset = (-c1 - math.sqrt(disc)) / (2*c2)
+        return onset if onset > t else np.inf
+    roots = _quartic_roots(c4, c3, c2, c1, c0)
+    best = np.inf
+    for k in range(4):
+        root = roots[k]
+        if abs(root.imag) < eps and t < root.real < best:
+            r = root.real
+            slope = ((4*c4*r + 3*c3)*r + 2*c2)*r + c1
+            if slope < 0: # contact onset, not an exit crossing
+                best = r
+    return best
+
+@njit(inline='always', cache=True, fastmath=True)
+def _pair_time(dx0, dx1, dv0, dv1, da0, da1, rr: float, t: float) -> float:
+    """Next onset time from a pair's relative state components."""
+    return _next_collision_time(
+        (da0*da0 + da1*da1) / 4,
+        dv0*da0 + dv1*da1,
+        dx0*da0 + dx1*da1 + dv0*dv0 + dv1*dv1,
+        (dx0*dv0 + dx1*dv1) * 2,
+        dx0*dx0 + dx1*dx1 - rr*rr,
+        t,
+    )
+
+@njit(parallel=True, cache=True, fastmath=True)
+def pair_next_collision(xa, va, aa, ra, xb, vb, ab, rb, t: float) -> np.ndarray:
+    r"""Elementwise next-collision times for pre-gathered pair rows:
+    entry p pairs A-row p with B-row p (shapes all (P, ...))."""
+    P = xa.shape[0]
+    out = np.empty(P, dtype=np.float64)
+    for p in prange(P):
+        out[p] = _pair_time(
+            xa[p,0] - xb[p,0], xa[p,1] - xb[p,1],
+            va[p,0] - vb[p,0], va[p,1] - vb[p,1],
+            aa[p,0] - ab[p,0], aa[p,1] - ab[p,1],
+            ra[p] + rb[p], t)
+    return out
+
+@njit(parallel=True, cache=True, fastmath=True)
+def batch_next_collision(xa, va, aa, ra, xb, vb, ab, rb, t: float, off: int, skip, out) -> np.ndarray:
+    r"""Next-collision times for every A-side x B-side ball pair.
+
+    Fills and returns `out`, an (M, U) float64 matrix of the next
+    collision time after `t` for A-ball i against B-ball j (`inf` when
+    the pair never collides); the caller owns the buffer so it can be
+    reused across calls.
+    B-side columns at `off` or beyond are taken to be the A-side balls
+    themselves in order, so cells pairing an A ball with itself or
+    duplicating an earlier A-A cell are skipped and NaN-filled, as are
+    cells flagged in the boolean `skip` matrix.
+    """
+    M = xa.shape[0]
+    U = xb.shape[0]
+    # rows are independent, so the outer loop parallelizes with no races
+    for i in prange(M):
+        for j in range(U):
+            if (j >= off and j - off <= i) or skip[i, j]:
+                out[i, j] = np.nan
+                continue
+            out[i, j] = _pair_time(
+                xa[i,0] - xb[j,0], xa[i,1] - xb[j,1],
+                va[i,0] - vb[j,0], va[i,1] - vb[j,1],
+                aa[i,0] - ab[j,0], aa[i,1] - ab[j,1],
+                ra[i] + rb[j], t)
+    return out
+
+@njit(parallel=True, cache=True, fastmath=True)
+def scan_next_collision(x, v, a, r, t: float) -> tuple:
+    r"""Earliest upcoming collision over all ball pairs, as row indices.
+
+    Returns `(t_min, i, j)` with `i < j`, scanning the strict upper
+    triangle with scalar arithmetic only -- no (N, N) matrix, mask, or
+    complex array is ever materialized.  With no collision upcoming the
+    first pair is reported with `t_min = inf`; with fewer than two balls
+    the indices are -1.
+
+    The outer loop runs under `prange`; every row reduces into its own
+    (best, j) slot -- so there are no cross-thread writes and the kernel
+    stays cacheable -- and a final single-threaded pass picks the overall
+    minimum, earliest row first, so the result is deterministic
+    regardless of scheduling.
+    """
+    n = x.shape[0]
+    best = np.full(n, np.inf)
+    bj = np.full(n, -1, dtype=np.int64)
+    for i in prange(n):
+        for j in range(i+1, n):
+            tt = _pair_time(
+                x[i,0] - x[j,0], x[i,1] - x[j,1],
+                v[i,0] - v[j,0], v[i,1] - v[j,1],
+                a[i,0] - a[j,0], a[i,1] - a[j,1],
+                r[i] + r[j], t)
+            if tt < best[i] or bj[i] < 0:
+                best[i] = tt
+                bj[i] = j
+    rbest = np.inf
+    ri = np.int64(-1)
+    rj = np.int64(-1)
+    for i in range(n):
+        if bj[i] >= 0 and (rj < 0 or best[i] < rbest):
+            rbest = best[i]
+            ri = np.int64(i)
+            rj = bj[i]
+    return rbest, ri, rj
+
+# Warm every pair kernel (and, transitively, the scalar solvers) at
+# import so the first simulation step doesn't pay the compile; with
+# cache=True this is a disk load on every run after a machine's first.
+_warm = np.zeros((0, 2))
+_warm_r = np.zeros(0)
+scan_next_collision(_warm, _warm, _warm, _warm_r, 0.)
+pair_next_collision(_warm, _warm, _warm, _warm_r, _warm, _warm, _warm, _warm_r, 0.)
+batch_next_collision(_warm, _warm, _warm, _warm_r, _warm, _warm, _warm, _warm_r,
+    0., 0, np.zeros((0, 0), dtype=bool), np.zeros((0, 0)))
+
+try: # prefer the AOT-built kernels when present (see _quartic_build)
+    from stepless._quartic_c import quartic_roots, next_collision_time
+except ImportError:
+    quartic_roots = _quartic_roots
+    next_collision_time = _next_collision_time
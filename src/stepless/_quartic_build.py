@@ -0,0 +1,32 @@
+"""Ahead-of-time build for the polynomial root kernels.
+
+The `@njit(cache=True)` kernels in `_quartic` still pay a one-time
+compile on the first run per machine (and a dispatcher fee per call).
+Running
+
+    python -m stepless._quartic_build
+
+compiles the scalar kernels into a prebuilt extension module
+`stepless._quartic_c`; `_quartic` prefers it whenever it's importable
+and falls back to the JIT definitions otherwise, so the build step is
+strictly optional.
+"""
+from pathlib import Path
+
+from numba.pycc import CC
+
+from stepless._quartic import _quartic_roots, _next_collision_time
+
+cc = CC('_quartic_c')
+cc.output_dir = str(Path(__file__).parent)
+
+@cc.export('quartic_roots', 'c16[:](f8,f8,f8,f8,f8)')
+def quartic_roots(c4, c3, c2, c1, c0):
+    return _quartic_roots(c4, c3, c2, c1, c0)
+
+@cc.export('next_collision_time', 'f8(f8,f8,f8,f8,f8,f8)')
+def next_collision_time(c4, c3, c2, c1, c0, t):
+    return _next_collision_time(c4, c3, c2, c1, c0, t)
+
+if __name__ == '__main__':
+    cc.compile()
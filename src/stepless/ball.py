@@ -1,14 +1,16 @@
-from dataclasses import dataclass, replace
+from dataclasses import dataclass
 import numpy as np
 from numpy.typing import NDArray
 from warnings import warn
 from typing import Union
 
 from stepless.types import scalar_T, vector_T, vec_zero, Massive
-from stepless.util import dot, next_time_after
+from stepless.util import dot
 from stepless.impulse import CollisionImpulse
+from stepless._quartic import quartic_roots, next_collision_time
+from stepless import _kinematics
 
-@dataclass
+@dataclass(slots=True)
 class Ball:
     x: vector_T = vec_zero
     r"""Virtual t=0 position state variable. $$\vec{x}_0$$"""
@@ -25,10 +27,10 @@ class Ball:
 
     def x_at(self, t: scalar_T) -> vector_T:
         r"""Position. $$\vec{x} = \frac{1}{2} \vec{a}_0 t^2 + \vec{v}_0 t + \vec{x}_0$$"""
-        return (self.a / 2 * t + self.v) * t + self.x
+        return _kinematics.x_at(self.x, self.v, self.a, t)
     def v_at(self, t: scalar_T) -> vector_T:
         r"""Velocity. $$\vec{v} = \vec{a}_0 t + \vec{v}_0$$"""
-        return self.a * t + self.v
+        return _kinematics.v_at(self.v, self.a, t)
     def a_at(self, t: scalar_T) -> vector_T:
         r"""Acceleration. $$\vec{a} = \vec{a}_0$$"""
         return self.a
@@ -57,36 +59,77 @@ class Ball:
         r"""Total energy. $$E = K + U$$"""
         return self.K_at(t) + self.U_at(t)
 
+    def _fast_copy(self, **kw) -> 'Ball':
+        """Copy with field overrides, bypassing `dataclasses.replace`'s
+        signature inspection and `__init__` keyword dispatch."""
+        new = object.__new__(type(self))
+        new.x = self.x
+        new.v = self.v
+        new.a = self.a
+        new.r = self.r
+        new.m = self.m
+        new.b = self.b
+        for k, v in kw.items():
+            setattr(new, k, v)
+        return new
+
     def _inplace_or_replace(self, inplace:bool, **kw):
         if inplace:
             for k, v in kw.items():
                 setattr(self, k, v)
             return self
         else:
-            return replace(self, **kw)
+            return self._fast_copy(**kw)
 
     def __add__(self, impulse: CollisionImpulse) -> 'Ball':
-        return self.apply_impulse(t=impulse.t, dx=impulse.dx, dv=impulse.dv)
+        return self._apply_collision(impulse.t, impulse.dx, impulse.dv)
     def __iadd__(self, impulse: CollisionImpulse) -> 'Ball':
-        return self.apply_impulse(t=impulse.t, dx=impulse.dx, dv=impulse.dv, inplace=True)
-    
+        return self._apply_collision(impulse.t, impulse.dx, impulse.dv, inplace=True)
+
+    def _apply_collision(self, t: scalar_T, dx: vector_T, dv: vector_T,
+            inplace: bool = False) -> 'Ball':
+        """Hot-path specialization of `apply_impulse` for collision
+        impulses, which only ever carry position and velocity deltas."""
+        new_x, new_v = _kinematics.collision_shift(self.x, self.v, dx, dv, t)
+        return self._inplace_or_replace(inplace, v=new_v, x=new_x)
+
     def apply_impulse(self, t: scalar_T,
-            dx: vector_T = vec_zero,
-            dv: vector_T = vec_zero,
-            da: vector_T = vec_zero,
-            dP: vector_T = vec_zero,
-            dF: vector_T = vec_zero,
+            dx: vector_T = None,
+            dv: vector_T = None,
+            da: vector_T = None,
+            dP: vector_T = None,
+            dF: vector_T = None,
             inplace: bool = False,
             ) -> 'Ball':
+        # None sentinels let the usual sparse impulses (only one or two
+        # deltas supplied) skip the arithmetic -- and the tiny-ndarray
+        # allocations -- for every delta that wasn't.
+        if dF is not None:
+            da = dF / self.m if da is None else da + dF / self.m
+        if dP is not None:
+            dv = dP / self.m if dv is None else dv + dP / self.m
 
-        da += dF / self.m
-        dv += dP / self.m
+        kw = {}
+        if da is not None:
+            kw['a'] = self.a + da
+        if da is not None or dv is not None:
+            new_v = self.v
+            if da is not None:
+                new_v = new_v - da*t
+            if dv is not None:
+                new_v = new_v + dv
+            kw['v'] = new_v
+        if da is not None or dv is not None or dx is not None:
+            new_x = self.x
+            if da is not None:
+                new_x = new_x + da/2*t*t
+            if dv is not None:
+                new_x = new_x - dv*t
+            if dx is not None:
+                new_x = new_x + dx
+            kw['x'] = new_x
+        return self._inplace_or_replace(inplace, **kw)
 
-        new_a = self.a + da
-        new_v = self.v - da*t + dv
-        new_x = self.x + (da/2*t - dv)*t + dx
-        return self._inplace_or_replace(inplace, a=new_a, v=new_v, x=new_x)
-    
     def apply_state(self, t: scalar_T,
             x: vector_T = None,
             v: vector_T = None,
@@ -95,39 +138,57 @@ class Ball:
             F: vector_T = None,
             inplace: bool = False,
             ):
-        dx = vec_zero if x is None else self.x_at(t) - x
-        dv = vec_zero if v is None else self.v_at(t) - v
-        da = vec_zero if a is None else self.a_at(t) - a
-        dP = vec_zero if P is None else self.P_at(t) - P
-        dF = vec_zero if F is None else self.F_at(t) - F
+        dx = None if x is None else x - self.x_at(t)
+        dv = None if v is None else v - self.v_at(t)
+        da = None if a is None else a - self.a_at(t)
+        dP = None if P is None else P - self.P_at(t)
+        dF = None if F is None else F - self.F_at(t)
         return self.apply_impulse(t=t,dx=dx,dv=dv,da=da,dP=dP,dF=dF,inplace=inplace)
 
     def get_collision_impulse(self, other: 'Ball', t: scalar_T) -> CollisionImpulse:
-        x = self.x_at(t) - other.x_at(t)
-        v = self.v_at(t) - other.v_at(t)
-        a = self.a_at(t) - other.a_at(t)
-        r = self.r + other.r
+        return self.impulse_from_separation(t,
+            self.x_at(t) - other.x_at(t),
+            self.v_at(t) - other.v_at(t),
+            self.r + other.r)
 
-        dx = x * (1 - r / np.linalg.norm(x)) # displacement required for exact contact
-        if not np.allclose(dx, vec_zero):
+    @staticmethod
+    def impulse_from_separation(t: scalar_T, x: vector_T, v: vector_T,
+            r: scalar_T) -> CollisionImpulse:
+        """Collision impulse for a pair with separation `x`, relative
+        velocity `v`, and contact distance `r` at time `t`.  Callers that
+        already hold the pair's relative state (e.g. from the quartic
+        coefficients) use this directly instead of re-evaluating the
+        per-ball kinematics."""
+        # dx is the displacement required for exact contact
+        dx, dv = _kinematics.collision_deltas(x, v, r)
+        if abs(dx[0]) > 1e-8 or abs(dx[1]) > 1e-8: # np.allclose's atol
             warn(f"Collision displacement is nonzero: {dx}")
-        dv = dot(v,x) / dot(x,x) * x
 
         return CollisionImpulse(t=t, dx=dx, dv=dv)
         
-    def compute_collision_times(self, other: 'Ball') -> NDArray:
-        x = self.x - other.x
-        v = self.v - other.v
-        a = self.a - other.a
+    def _collision_coefficients(self, other: 'Ball') -> tuple:
+        """The five quartic coefficients of the pair's squared-separation
+        polynomial, computed as plain scalars: for known-2D state,
+        inlining the dot products skips a dozen tiny-ndarray dispatches
+        per pair."""
+        x0 = self.x[0] - other.x[0]
+        x1 = self.x[1] - other.x[1]
+        v0 = self.v[0] - other.v[0]
+        v1 = self.v[1] - other.v[1]
+        a0 = self.a[0] - other.a[0]
+        a1 = self.a[1] - other.a[1]
         r = self.r + other.r
-        
-        return np.poly1d((
-            dot(a,a) / 4,
-            dot(v,a),
-            dot(x,a) + dot(v,v),
-            dot(x,v) * 2,
-            dot(x,x) - r*r,
-        )).roots
+
+        return (
+            (a0*a0 + a1*a1) / 4,
+            v0*a0 + v1*a1,
+            x0*a0 + x1*a1 + v0*v0 + v1*v1,
+            (x0*v0 + x1*v1) * 2,
+            x0*x0 + x1*x1 - r*r,
+        )
+
+    def compute_collision_times(self, other: 'Ball') -> NDArray:
+        return quartic_roots(*self._collision_coefficients(other))
 
     def compute_next_collision_time(self, other: 'Ball', t: scalar_T) -> scalar_T:
-        return next_time_after(self.compute_collision_times(other), t=t)
+        return next_collision_time(*self._collision_coefficients(other), t)
@@ -1,5 +1,6 @@
 
-from dataclasses import dataclass, replace
+from dataclasses import dataclass
+import operator
 from typing import ClassVar
 
 from stepless.ball import Ball
@@ -9,19 +10,24 @@ from stepless.types import scalar_T
 class VarDescriptor:
     def __init__(self, name:str=None):
         self.var = name
+        self._getter = None if name is None else operator.attrgetter(name+"_at")
     def __set_name__(self, owner, name):
         if self.var is None:
             self.var = name
+            # bind the accessor handle once at class creation so reads
+            # don't re-do the string concat + getattr every access
+            self._getter = operator.attrgetter(name+"_at")
     def __get__(self, obj: 'BallView', objtype=None):
         if obj is None: raise AttributeError
-        return getattr(obj.ball, self.var+"_at")(obj.t)
+        return self._getter(obj.ball)(obj.t)
 
 class SetttableVarDescriptor(VarDescriptor):
     def __set__(self, obj: 'BallView', value):
         if obj.modify_inplace:
             setattr(obj.ball, self.var, value)
         else:
-            obj.ball = replace(obj.ball, **{self.var: value})
+            # _fast_copy skips dataclasses.replace's signature inspection
+            obj.ball = obj.ball._fast_copy(**{self.var: value})
 
 class ImpulseableVarDescriptor(VarDescriptor):
     def __set__(self, obj: 'BallView', value):
@@ -1,9 +1,9 @@
 from typing import Union
-from dataclasses import dataclass, replace
+from dataclasses import dataclass
 import numpy as np
 from stepless.types import scalar_T, vector_T, vec_zero, Massive, massable_T
 
-@dataclass
+@dataclass(slots=True)
 class CollisionImpulse:
     t: scalar_T
     dx: vector_T = vec_zero
@@ -21,7 +21,9 @@ class CollisionImpulse:
     #     self.dv = self.dv / (1+old_e) * (1+self._e)
     
     def with_restitution(self, e: scalar_T) -> 'CollisionImpulse':
-        return replace(self, dv=self.dv*(1+e))
+        if e == 0: # dv*(1+0) is a no-op; skip the clone
+            return self
+        return CollisionImpulse(self.t, self.dx, self.dv*(1+e))
     
     def split(self, m1: massable_T, m2: massable_T) -> 'tuple[CollisionImpulse, CollisionImpulse]':
         """Split this impulse into two pieces based on relative masses."""
@@ -29,38 +31,38 @@ class CollisionImpulse:
         m2 = Massive.mass_of(m2)
         if np.isinf(m1) and not np.isinf(m2):
             return (
-                replace(self, dx= vec_zero, dv= vec_zero),
+                CollisionImpulse(self.t, vec_zero, vec_zero),
                 self,
             )
         elif not np.isinf(m1) and np.isinf(m2):
             return (
                 -self,
-                replace(self, dx= vec_zero, dv= vec_zero),
+                CollisionImpulse(self.t, vec_zero, vec_zero),
             )
         else: # if both infinite, the standard behavior already correctly returns NaNs
             denom = m1 + m2
             f1 = -m2 / denom
             f2 = m1 / denom
             return (
-                replace(self, dx= self.dx*f1, dv= self.dv*f1),
-                replace(self, dx= self.dx*f2, dv= self.dv*f2),
+                CollisionImpulse(self.t, self.dx*f1, self.dv*f1),
+                CollisionImpulse(self.t, self.dx*f2, self.dv*f2),
             )
     
     def __add__(self, other: 'CollisionImpulse') -> 'CollisionImpulse':
         if not np.isclose(self.t, other.t):
             return NotImplemented
-        return replace(self, dx=self.dx + other.dx, dv=self.dv + other.dv)
+        return CollisionImpulse(self.t, self.dx + other.dx, self.dv + other.dv)
     def __sub__(self, other: 'CollisionImpulse') -> 'CollisionImpulse':
         if not np.isclose(self.t, other.t):
             return NotImplemented
-        return replace(self, dx=self.dx - other.dx, dv=self.dv - other.dv)
+        return CollisionImpulse(self.t, self.dx - other.dx, self.dv - other.dv)
     def __mul__(self, other: scalar_T) -> 'CollisionImpulse':
-        return replace(self, dx=self.dx*other, dv=self.dv*other)
+        return CollisionImpulse(self.t, self.dx*other, self.dv*other)
     def __rmul__(self, other: scalar_T) -> 'CollisionImpulse':
-        return replace(self, dx=self.dx*other, dv=self.dv*other)
+        return CollisionImpulse(self.t, self.dx*other, self.dv*other)
     def __truediv__(self, other: scalar_T) -> 'CollisionImpulse':
-        return replace(self, dx=self.dx/other, dv=self.dv/other)
+        return CollisionImpulse(self.t, self.dx/other, self.dv/other)
     def __pos__(self) -> 'CollisionImpulse':
         return self
     def __neg__(self) -> 'CollisionImpulse':
-        return replace(self, dx=-self.dx, dv=-self.dv)
\ No newline at end of file
+        return CollisionImpulse(self.t, -self.dx, -self.dv)
\ No newline at end of file
@@ -1,10 +1,10 @@
 
-from dataclasses import InitVar, dataclass, field
-from uuid import UUID
+from dataclasses import dataclass, field
 import heapq
+from stepless.ball import Ball
 from stepless.universe import Universe
-from stepless.types import scalar_T
-from stepless.util import dot
+from stepless.types import BallKey, scalar_T
+from stepless._quartic import batch_next_collision
 import numpy as np
 
 class TimeTravelError(Exception):
@@ -12,96 +12,179 @@ class TimeTravelError(Exception):
 
 
 
-@dataclass(slots=True, unsafe_hash=True)
-class CollisionHeapKey:
-    k1: UUID
-    k2: UUID
-    def __post_init__(self):
-        self.k1, self.k2 = sorted((self.k1, self.k2))
-
-@dataclass(order=True, slots=True)
-class CollisionHeapItem:
-    universe: InitVar[Universe]
-    key: CollisionHeapKey = field(compare=False)
-    void: bool = field(default=False, compare=False)
-    t: scalar_T = None
-    def __post_init__(self, universe):
-        self.t = universe.contents[self.key.k1].compute_next_collision_time(universe.contents[self.key.k2], universe.t)
-
 @dataclass
 class CollisionHeap:
-    _heap: list[CollisionHeapItem] = field(default_factory=list)
-    _map: dict[CollisionHeapKey, CollisionHeapItem] = field(default_factory=dict) # so we can void old collisions
+    """Lazy-deletion min-heap of pairwise collision events.
+
+    Entries are plain `(t, version, (k1, k2))` tuples so heap sifting
+    compares floats directly instead of dispatching through dataclass
+    `__lt__`. A recomputed pair supersedes its old entry by bumping the
+    pair's version counter; stale entries are recognized on pop by a
+    version mismatch and silently discarded.
+    """
+    _heap: list[tuple] = field(default_factory=list)
+    _versions: dict[tuple, int] = field(default_factory=dict)
+    _stored: set[tuple] = field(default_factory=set) # pairs with a live heap entry
     void_count: int = 0
     entry_count: int = 0
 
-    def push(self, timeline: 'Timeline', k1: UUID, k2: UUID):
-        key = CollisionHeapKey(k1, k2)
-        item = CollisionHeapItem(timeline, key)
-        self._push(item)
-
-    def _push(self, item: CollisionHeapItem):
-        if item.key in self:
-            self._map[item.key].void = True # a recomputed collision time automatically supercedes the old collision time
-            self.void_count += 1 
-            del self._map[item.key]
-
-        if np.isfinite(item.t): # infinite = they don't collide; don't need to store that
-            self._map[item.key] = item
-            heapq.heappush(self._heap, item)
+    def void(self, k1: BallKey, k2: BallKey):
+        """Invalidate a pair's entry without recomputing a replacement."""
+        key = (k1, k2) if k1 < k2 else (k2, k1)
+        if key in self._stored:
+            self._versions[key] += 1
+            self._stored.discard(key)
+            self.void_count += 1
+
+    def push(self, timeline: 'Timeline', k1: BallKey, k2: BallKey, t: scalar_T = None):
+        key = (k1, k2) if k1 < k2 else (k2, k1)
+        if t is None:
+            t = timeline.contents[k1].compute_next_collision_time(timeline.contents[k2], timeline.t)
+        version = self._versions.get(key, 0) + 1
+        self._versions[key] = version
+        if key in self._stored: # a recomputed collision time automatically supercedes the old collision time
+            self._stored.discard(key)
+            self.void_count += 1
+        if np.isfinite(t): # infinite = they don't collide; don't need to store that
+            self._stored.add(key)
+            heapq.heappush(self._heap, (t, version, key))
             self.entry_count += 1
 
     def next(self) -> scalar_T:
-        while self._heap and self._heap[0].void:
-            self._pop()
-        if self._heap:
-            return self._heap[0].t
+        heap = self._heap
+        while heap and heap[0][1] != self._versions[heap[0][2]]:
+            heapq.heappop(heap)
+            self.entry_count -= 1
+            self.void_count -= 1
+        if heap:
+            return heap[0][0]
         else:
             return np.inf
 
-    def pop(self) -> tuple[scalar_T, UUID, UUID]:
-        item = self._pop()
-        return item.t, item.key.k1, item.key.k2
-        
-    def _pop(self) -> CollisionHeapItem:
+    def pop(self) -> tuple[scalar_T, BallKey, BallKey]:
         while self._heap:
-            item = heapq.heappop(self._heap)
+            t, version, key = heapq.heappop(self._heap)
             self.entry_count -= 1
-            if item.void:
+            if version != self._versions[key]:
                 self.void_count -= 1
             else:
-                del self._map[item.key]
-                return item
-    
+                self._stored.discard(key)
+                return t, key[0], key[1]
+
     def __len__(self):
         return self.entry_count - self.void_count
-    def __contains__(self, item: CollisionHeapKey):
-        return item in self._map
-
-
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._stored
+
+
+
+def _x_extents(x, v, a, r, t0: scalar_T, t1: scalar_T):
+    """Bounds on each ball's x-axis extent over `[t0, t1]`.
+
+    The x-projection of each trajectory is a parabola, so its extreme
+    values on the interval sit at the endpoints or at the interior
+    vertex `-v/a`; padding by the radius gives a conservative interval.
+    """
+    x0 = x[:,0]
+    v0 = v[:,0]
+    a0 = a[:,0]
+    p0 = (a0/2*t0 + v0)*t0 + x0
+    p1 = (a0/2*t1 + v0)*t1 + x0
+    lo = np.minimum(p0, p1)
+    hi = np.maximum(p0, p1)
+    tv = np.where(a0 != 0, -v0 / np.where(a0 != 0, a0, 1.), np.inf)
+    inside = (t0 < tv) & (tv < t1)
+    tv = np.where(inside, tv, t0)
+    pv = (a0/2*tv + v0)*tv + x0
+    lo = np.where(inside & (pv < lo), pv, lo)
+    hi = np.where(inside & (pv > hi), pv, hi)
+    return lo - r, hi + r
 
 @dataclass
 class Timeline(Universe):
 
     future: CollisionHeap = field(default_factory=CollisionHeap)
+    _deferred: set[tuple] = field(default_factory=set, repr=False)
+    _deferred_horizon: scalar_T = field(default=np.inf, repr=False)
+    _scratch: np.ndarray = field(default=None, repr=False)
+
+    def _scratch_for(self, m: int, u: int) -> np.ndarray:
+        """A reusable (m, u) view into a grow-only scratch buffer, so the
+        per-recompute result matrix isn't reallocated every call."""
+        if self._scratch is None or self._scratch.shape[0] < m or self._scratch.shape[1] < u:
+            grow = (m, u) if self._scratch is None else (
+                max(m, self._scratch.shape[0]), max(u, self._scratch.shape[1]))
+            self._scratch = np.empty(grow, dtype=np.float64)
+        return self._scratch[:m, :u]
 
     def recompute_future(self):
-        unmodified = self.contents.keys() - self.modified
-        while self.modified:
-            k1 = self.modified.pop()
-            for k2 in unmodified:
-                self.future.push(self, k1, k2)
-            unmodified.add(k1)
+        if not self.modified:
+            return
+        contents = self.contents
+        mkeys = list(self.modified)
+        bkeys = list(contents.keys() - self.modified) + mkeys
+        off = len(bkeys) - len(mkeys)
+        self.modified.clear()
+
+        mi = np.array([contents.index_of(k) for k in mkeys], dtype=np.intp)
+        bi = np.array([contents.index_of(k) for k in bkeys], dtype=np.intp)
+
+        # Broad phase: pairs whose x-extents can't meet before the next
+        # already-known event can't collide first, so their quartic solve
+        # is deferred until the horizon is reached.
+        horizon = self.future.next()
+        if np.isfinite(horizon):
+            lo, hi = _x_extents(contents.x, contents.v, contents.a, contents.r,
+                self.t, horizon)
+            skip = (lo[mi][:,None] > hi[bi][None,:]) | (hi[mi][:,None] < lo[bi][None,:])
+        else:
+            skip = np.zeros((len(mkeys), len(bkeys)), dtype=bool)
+
+        times = batch_next_collision(
+            contents.x[mi], contents.v[mi], contents.a[mi], contents.r[mi],
+            contents.x[bi], contents.v[bi], contents.a[bi], contents.r[bi],
+            self.t, off, skip, self._scratch_for(len(mkeys), len(bkeys)))
+        # infinite times still get pushed: they void a pair's stale entry
+        for i, j in zip(*np.nonzero(~np.isnan(times))):
+            k1, k2 = mkeys[i], bkeys[j]
+            self._deferred.discard((k1, k2) if k1 < k2 else (k2, k1))
+            self.future.push(self, k1, k2, t=times[i, j])
+        if skip.any():
+            for i, j in zip(*np.nonzero(skip)):
+                if j >= off and j - off <= i:
+                    continue # self/duplicate cell, not a real pair
+                k1, k2 = mkeys[i], bkeys[j]
+                self.future.void(k1, k2) # its old entry predates the modification
+                self._deferred.add((k1, k2) if k1 < k2 else (k2, k1))
+            self._deferred_horizon = min(self._deferred_horizon, horizon)
+
+    def _flush_deferred(self):
+        """Compute the collision times of pairs the broad phase skipped."""
+        deferred, self._deferred = self._deferred, set()
+        self._deferred_horizon = np.inf
+        for k1, k2 in deferred:
+            self.future.push(self, k1, k2)
 
     def do_next_collision(self):
+        if self._deferred and self.future.next() >= self._deferred_horizon:
+            self._flush_deferred() # a pruned pair may collide before this event
         t, k1, k2 = self.future.pop()
-        b1 = self.contents[k1]
-        b2 = self.contents[k2]
-        i = b1.get_collision_impulse(b2, t)
-        i = i.with_restitution(dot(b1.b,b2.b))
-        i1, i2 = i.split(b1.m, b2.m)
-        b1 += i1
-        b2 += i2
+        contents = self.contents
+        j1 = contents.index_of(k1)
+        j2 = contents.index_of(k2)
+        # relative state straight from the rows: evaluating the relative
+        # quadratic once beats four per-ball kinematic evaluations
+        dx0 = contents.x[j1] - contents.x[j2]
+        dv0 = contents.v[j1] - contents.v[j2]
+        da0 = contents.a[j1] - contents.a[j2]
+        i = Ball.impulse_from_separation(t,
+            (da0/2*t + dv0)*t + dx0,
+            da0*t + dv0,
+            contents.r[j1] + contents.r[j2])
+        i = i.with_restitution(self.restitution(k1, k2))
+        i1, i2 = i.split(contents.m[j1], contents.m[j2])
+        contents.apply_collision(j1, t, i1.dx, i1.dv)
+        contents.apply_collision(j2, t, i2.dx, i2.dv)
         self.t = t
         self.modified.add(k1)
         self.modified.add(k2)
@@ -113,8 +196,13 @@ class Timeline(Universe):
             raise TimeTravelError(f"Cannot step backwards from t={self.t} to t={t}.")
         if self.modified:
             self.recompute_future()
-        while t > self.future.next():
-            self.do_next_collision()
+        while True:
+            if self._deferred and t >= self._deferred_horizon:
+                self._flush_deferred() # can't pass the horizon unexamined
+            if t > self.future.next():
+                self.do_next_collision()
+            else:
+                break
         self.t = t
     
     def add(self, obj: 'Ball') -> 'BallUniverseView':
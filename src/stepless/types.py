@@ -10,7 +10,16 @@ vector_T = np.ndarray[(2,), scalar_T]
 """Vector type used by simulation."""
 
 vec_zero = np.zeros(2, dtype=scalar_T)
-"""Zero vector constant, for convenience."""
+"""Zero vector constant, for convenience.
+
+Marked read-only since it's shared as a default argument all over;
+an accidental in-place update would silently corrupt every caller.
+"""
+vec_zero.flags.writeable = False
+
+BallKey = int
+"""Key type handed out by `Universe.mk_key`: a monotonically increasing
+integer, unique within its universe."""
 
 massable_T = Union['Massive', scalar_T]
 
@@ -1,71 +1,254 @@
 
 from dataclasses import dataclass, field
-import itertools
-from typing import ClassVar
-from uuid import UUID, uuid4
+import heapq
+from typing import ClassVar, Iterator
+
+import numpy as np
+from numpy.typing import NDArray
 
 from stepless.ball import Ball
 from stepless.ballview import ImpulseableVarDescriptor, SetttableVarDescriptor, VarDescriptor
-from stepless.types import scalar_T
-from stepless.util import dot
+from stepless.types import BallKey, scalar_T
+from stepless._quartic import batch_next_collision, pair_next_collision
+
+def _empty_vectors() -> NDArray:
+    return np.empty((0,2), dtype=scalar_T)
+def _empty_scalars() -> NDArray:
+    return np.empty(0, dtype=scalar_T)
+
+@dataclass
+class UniverseArrays:
+    r"""Struct-of-arrays storage for ball state.
+
+    Each state variable lives in one contiguous float64 array with a row
+    (or entry) per ball, so pairwise kernels can sweep whole arrays at
+    once instead of chasing pointers through per-ball objects.  The
+    key-to-row mapping only matters at the API boundary: this class still
+    presents the `dict[key, Ball]` interface the rest of the code expects,
+    materializing `Ball` copies on demand.
+    """
+    x: NDArray = field(default_factory=_empty_vectors)
+    v: NDArray = field(default_factory=_empty_vectors)
+    a: NDArray = field(default_factory=_empty_vectors)
+    r: NDArray = field(default_factory=_empty_scalars)
+    m: NDArray = field(default_factory=_empty_scalars)
+    b: NDArray = field(default_factory=_empty_vectors)
+    rev: int = 0
+    """Revision counter, bumped on every write; lets views and other
+    callers cache state materialized from the arrays."""
+    b_rev: int = 0
+    """Revision counter, bumped whenever any ball's restitution vector
+    changes; lets callers cache values derived from `b`."""
+    _index: dict[BallKey, int] = field(default_factory=dict)
+
+    def index_of(self, key: BallKey) -> int:
+        """Row index of the ball stored under `key`."""
+        return self._index[key]
+
+    def ball_at(self, idx: int) -> Ball:
+        """Materialize a `Ball` copy of row `idx`."""
+        return Ball(
+            x=self.x[idx].copy(),
+            v=self.v[idx].copy(),
+            a=self.a[idx].copy(),
+            r=self.r[idx],
+            m=self.m[idx],
+            b=self.b[idx].copy(),
+        )
+
+    def __getitem__(self, key: BallKey) -> Ball:
+        return self.ball_at(self._index[key])
+
+    def __setitem__(self, key: BallKey, ball: Ball):
+        self.rev += 1
+        idx = self._index.get(key)
+        if idx is None:
+            self._index[key] = len(self._index)
+            self.x = np.vstack((self.x, [ball.x]))
+            self.v = np.vstack((self.v, [ball.v]))
+            self.a = np.vstack((self.a, [ball.a]))
+            self.r = np.append(self.r, ball.r)
+            self.m = np.append(self.m, ball.m)
+            self.b = np.vstack((self.b, [ball.b]))
+            self.b_rev += 1
+        else:
+            self.x[idx] = ball.x
+            self.v[idx] = ball.v
+            self.a[idx] = ball.a
+            self.r[idx] = ball.r
+            self.m[idx] = ball.m
+            if not np.array_equal(self.b[idx], ball.b):
+                self.b[idx] = ball.b
+                self.b_rev += 1
+
+    def apply_collision(self, idx: int, t: scalar_T, dx: NDArray, dv: NDArray):
+        """Apply a collision impulse straight to row `idx`, skipping the
+        materialize-Ball / write-back round trip of `__setitem__`."""
+        self.rev += 1
+        self.v[idx] += dv
+        self.x[idx] += dx - dv*t
+
+    def keys(self):
+        return self._index.keys()
+    def __iter__(self) -> Iterator[BallKey]:
+        return iter(self._index)
+    def __len__(self) -> int:
+        return len(self._index)
+    def __contains__(self, key: BallKey) -> bool:
+        return key in self._index
 
 @dataclass
 class Universe:
     t: scalar_T
-    contents: dict[UUID, Ball] = field(default_factory=dict)
-    modified: set[UUID] = field(default_factory=set)
+    contents: UniverseArrays = field(default_factory=UniverseArrays)
+    modified: set[BallKey] = field(default_factory=set)
+    _next_key: int = field(default=0, init=False, repr=False)
+    _R: NDArray = field(default=None, init=False, repr=False)
+    _R_rev: int = field(default=-1, init=False, repr=False)
+    _queue: list[tuple] = field(default_factory=list, init=False, repr=False)
+    _epochs: dict[BallKey, int] = field(default_factory=dict, init=False, repr=False)
+    _pair_idx: tuple = field(default=None, init=False, repr=False)
 
-    def mk_key(self):
-        return uuid4()
+    def _pairs(self) -> tuple:
+        """Strict-upper-triangle row index pair, cached until N changes."""
+        n = len(self.contents)
+        if self._pair_idx is None or len(self._pair_idx[0]) != n*(n-1)//2:
+            self._pair_idx = np.triu_indices(n, 1)
+        return self._pair_idx
+
+    def mk_key(self) -> BallKey:
+        key = self._next_key
+        self._next_key += 1
+        return key
+
+    def restitution(self, k1: BallKey, k2: BallKey) -> scalar_T:
+        r"""Restitution product for a pair. $$R = b_1 \cdot b_2$$
+
+        Reads from an NxN matrix computed in one matmul and cached until
+        some ball's restitution vector changes.
+        """
+        c = self.contents
+        if self._R_rev != c.b_rev:
+            self._R = c.b @ c.b.T
+            self._R_rev = c.b_rev
+        return self._R[c.index_of(k1), c.index_of(k2)]
 
     def add(self, obj: Ball) -> 'BallUniverseView':
         key = self.mk_key()
         self.contents[key] = obj
         return BallUniverseView(self, key)
 
-    def get(self, key: UUID) -> 'BallUniverseView':
+    def get(self, key: BallKey) -> 'BallUniverseView':
         return BallUniverseView(self, key)
-    
+
+    def _requeue(self, keys: 'list[BallKey]'):
+        """Recompute the pair times of `keys` against every other ball
+        (one batched kernel call) and queue the finite results.  Bumping
+        each key's epoch first leaves any older queued entry for it
+        stale, so nothing needs to be deleted from the queue."""
+        c = self.contents
+        all_keys = list(c.keys())
+        n = len(c)
+        mi = np.empty(len(keys), dtype=np.intp)
+        skip = np.zeros((len(keys), n), dtype=bool)
+        for row, k in enumerate(keys):
+            mi[row] = c.index_of(k)
+            skip[row:, mi[row]] = True # self cell, and dups of key-key pairs
+            self._epochs[k] = self._epochs.get(k, 0) + 1
+        times = batch_next_collision(
+            c.x[mi], c.v[mi], c.a[mi], c.r[mi],
+            c.x, c.v, c.a, c.r,
+            self.t, n, skip, np.empty((len(keys), n)))
+        for i, j in zip(*np.nonzero(np.isfinite(times))):
+            k1, k2 = keys[i], all_keys[j]
+            heapq.heappush(self._queue,
+                (times[i, j], k1, k2, self._epochs[k1], self._epochs.get(k2, 0)))
+
+    def _next_collision(self) -> tuple[scalar_T, BallKey, BallKey]:
+        """Earliest upcoming collision as `(t, k1, k2)`.
+
+        Maintained incrementally: only balls added or modified since the
+        last call get their pair times recomputed, so a step costs
+        O(N log N) instead of a full O(N^2) rescan.  Entries are
+        invalidated by per-ball epoch counters and skipped lazily on pop.
+        """
+        stale = [k for k in self.contents if k not in self._epochs]
+        stale += [k for k in self.modified if k not in stale]
+        self.modified.clear()
+        if stale:
+            self._requeue(stale)
+        queue = self._queue
+        while queue:
+            t, k1, k2, e1, e2 = queue[0]
+            if e1 != self._epochs[k1] or e2 != self._epochs[k2]:
+                heapq.heappop(queue) # a participant changed since this was computed
+            else:
+                return t, k1, k2
+        raise ValueError("universe has no upcoming collision")
+
     def advance_past_next_collision(self):
-        t, ka, kb = min(self._compute_next_collision_times())
-        a = self.contents[ka]
-        b = self.contents[kb]
-        i = a.get_collision_impulse(b, t)
-        i = i.with_restitution(dot(a.b,b.b))
-        ia, ib = i.split(a, b)
-        a.apply_impulse(ia)
-        b.apply_impulse(ib)
-        self.contents[ka] = a
-        self.contents[kb] = b
+        t, ka, kb = self._next_collision()
+        c = self.contents
+        ja = c.index_of(ka)
+        jb = c.index_of(kb)
+        dx0 = c.x[ja] - c.x[jb]
+        dv0 = c.v[ja] - c.v[jb]
+        da0 = c.a[ja] - c.a[jb]
+        i = Ball.impulse_from_separation(t,
+            (da0/2*t + dv0)*t + dx0,
+            da0*t + dv0,
+            c.r[ja] + c.r[jb])
+        i = i.with_restitution(self.restitution(ka, kb))
+        ia, ib = i.split(c.m[ja], c.m[jb])
+        c.apply_collision(ja, t, ia.dx, ia.dv)
+        c.apply_collision(jb, t, ib.dx, ib.dv)
+        self.modified.update((ka, kb))
         self.t = t
         return self
-    
+
     def _compute_next_collision_times(self):
-        for ka,kb in itertools.combinations(self.contents, 2):
-            a = self.contents[ka]
-            b = self.contents[kb]
-            yield a.compute_next_collision_time(b), ka,kb
-    
+        # gather the cached triangular index pair straight out of the
+        # state arrays and solve elementwise -- no (N, N) matrix, mask,
+        # or per-pair dict lookups, and combinations order is preserved
+        c = self.contents
+        keys = list(c.keys())
+        I, J = self._pairs()
+        times = pair_next_collision(
+            c.x[I], c.v[I], c.a[I], c.r[I],
+            c.x[J], c.v[J], c.a[J], c.r[J],
+            self.t)
+        for i, j, tt in zip(I, J, times):
+            yield tt, keys[i], keys[j]
+
     def __iter__(self):
         for key in self.contents:
             yield BallUniverseView(self, key)
 
-@dataclass
+@dataclass(slots=True)
 class BallUniverseView:
     universe: Universe
-    key: UUID
+    key: BallKey
+    _ball_cache: Ball = field(default=None, init=False, repr=False, compare=False)
+    _ball_rev: int = field(default=-1, init=False, repr=False, compare=False)
 
     @property
     def ball(self):
-        return self.universe.contents[self.key]
+        # each read materializes a Ball from the array rows, so cache it
+        # against the store's revision counter: kinematic accessors that
+        # read several variables between writes hit the store only once
+        store = self.universe.contents
+        if self._ball_rev != store.rev:
+            self._ball_cache = store[self.key]
+            self._ball_rev = store.rev
+        return self._ball_cache
     @ball.setter
-    def _(self, value):
+    def ball(self, value):
         self.universe.contents[self.key] = value
         self.universe.modified.add(self.key)
 
     @property
     def modify_inplace(self):
-        False
+        return False
 
     @property
     def t(self):
@@ -81,4 +264,4 @@ class BallUniverseView:
     F: ClassVar = ImpulseableVarDescriptor()
     U: ClassVar = VarDescriptor()
     K: ClassVar = VarDescriptor()
-    E: ClassVar = VarDescriptor()
\ No newline at end of file
+    E: ClassVar = VarDescriptor()
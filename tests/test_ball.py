@@ -6,17 +6,15 @@ from numpy import array as A
 
 from laws import centroid, momentum, kinetic_energy, assert_conservation_law_obeyed
 
-def random_vector():
-    return np.random.rand(2) * 10
-
 @pytest.mark.parametrize('n', range(5))
 def test_impulse_dx(n):
-    np.random.seed(n)
-    b1 = Ball(x=random_vector(), v=random_vector(), a=random_vector(), r=1)
-    t = np.random.rand()
+    rng = np.random.default_rng(n)
+    vs = rng.random((4,2)) * 10
+    b1 = Ball(x=vs[0], v=vs[1], a=vs[2], r=1)
+    t = rng.random()
 
     b1v, b1a = b1.v_at(t), b1.a_at(t)
-    b2 = b1.apply_impulse(t=t, dx=random_vector())
+    b2 = b1.apply_impulse(t=t, dx=vs[3])
     b2v, b2a = b2.v_at(t), b2.a_at(t)
 
     assert np.allclose(b1v, b2v)
@@ -24,12 +22,13 @@ def test_impulse_dx(n):
 
 @pytest.mark.parametrize('n', range(5))
 def test_impulse_dv(n):
-    np.random.seed(n)
-    b1 = Ball(x=random_vector(), v=random_vector(), a=random_vector(), r=1)
-    t = np.random.rand()
+    rng = np.random.default_rng(n)
+    vs = rng.random((4,2)) * 10
+    b1 = Ball(x=vs[0], v=vs[1], a=vs[2], r=1)
+    t = rng.random()
 
     b1x, b1a = b1.x_at(t), b1.a_at(t)
-    b2 = b1.apply_impulse(t=t, dv=random_vector())
+    b2 = b1.apply_impulse(t=t, dv=vs[3])
     b2x, b2a = b2.x_at(t), b2.a_at(t)
 
     assert np.allclose(b1x, b2x)
@@ -37,12 +36,13 @@ def test_impulse_dv(n):
 
 @pytest.mark.parametrize('n', range(5))
 def test_impulse_da(n):
-    np.random.seed(n)
-    b1 = Ball(x=random_vector(), v=random_vector(), a=random_vector(), r=1)
-    t = np.random.rand()
+    rng = np.random.default_rng(n)
+    vs = rng.random((4,2)) * 10
+    b1 = Ball(x=vs[0], v=vs[1], a=vs[2], r=1)
+    t = rng.random()
 
     b1x, b1v = b1.x_at(t), b1.v_at(t)
-    b2 = b1.apply_impulse(t=t, da=random_vector())
+    b2 = b1.apply_impulse(t=t, da=vs[3])
     b2x, b2v = b2.x_at(t), b2.v_at(t)
 
     assert np.allclose(b1x, b2x)
@@ -50,36 +50,39 @@ def test_impulse_da(n):
 
 @pytest.mark.parametrize('n', range(5))
 def test_impulse_dx_dv(n):
-    np.random.seed(n)
-    b1 = Ball(x=random_vector(), v=random_vector(), a=random_vector(), r=1)
-    t = np.random.rand()
+    rng = np.random.default_rng(n)
+    vs = rng.random((5,2)) * 10
+    b1 = Ball(x=vs[0], v=vs[1], a=vs[2], r=1)
+    t = rng.random()
 
     b1a = b1.a_at(t)
-    b2 = b1.apply_impulse(t=t, dx=random_vector(), dv=random_vector())
+    b2 = b1.apply_impulse(t=t, dx=vs[3], dv=vs[4])
     b2a = b2.a_at(t)
 
     assert np.allclose(b1a, b2a)
 
 @pytest.mark.parametrize('n', range(5))
 def test_impulse_dx_da(n):
-    np.random.seed(n)
-    b1 = Ball(x=random_vector(), v=random_vector(), a=random_vector(), r=1)
-    t = np.random.rand()
+    rng = np.random.default_rng(n)
+    vs = rng.random((5,2)) * 10
+    b1 = Ball(x=vs[0], v=vs[1], a=vs[2], r=1)
+    t = rng.random()
 
     b1v = b1.v_at(t)
-    b2 = b1.apply_impulse(t=t, dx=random_vector(), da=random_vector())
+    b2 = b1.apply_impulse(t=t, dx=vs[3], da=vs[4])
     b2v = b2.v_at(t)
 
     assert np.allclose(b1v, b2v)
 
 @pytest.mark.parametrize('n', range(5))
 def test_impulse_dv_da(n):
-    np.random.seed(n)
-    b1 = Ball(x=random_vector(), v=random_vector(), a=random_vector(), r=1)
-    t = np.random.rand()
+    rng = np.random.default_rng(n)
+    vs = rng.random((5,2)) * 10
+    b1 = Ball(x=vs[0], v=vs[1], a=vs[2], r=1)
+    t = rng.random()
 
     b1x = b1.x_at(t)
-    b2 = b1.apply_impulse(t=t, dv=random_vector(), da=random_vector())
+    b2 = b1.apply_impulse(t=t, dv=vs[3], da=vs[4])
     b2x = b2.x_at(t)
 
     assert np.allclose(b1x, b2x)